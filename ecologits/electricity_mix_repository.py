@@ -1,8 +1,14 @@
+import csv
 import os
-from csv import DictReader
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+DEFAULT_ELECTRICITY_MIXES_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "data", "electricity_mixes.csv"
+)
+
 
 @dataclass
 class ElectricityMix:
@@ -15,6 +21,8 @@ class ElectricityMix:
         pe: Primary Energy of the mix (in MJ / kWh)
         gwp: Global Warming Potential of the mix (in kgCO2eq / kWh)
     """
+    __slots__ = ("adpe", "gwp", "pe", "zone")
+
     zone: str
     adpe: float
     pe: float
@@ -27,33 +35,58 @@ class ElectricityMixRepository:
     """
 
     def __init__(self, electricity_mixes: list[ElectricityMix]) -> None:
-        self.__electricity_mixes = electricity_mixes
+        self.__electricity_mixes: dict[str, ElectricityMix] = {m.zone: m for m in electricity_mixes}
 
     def find_electricity_mix(self, zone: str) -> Optional[ElectricityMix]:
-        for electricity_mix in self.__electricity_mixes:
-            if electricity_mix.zone == zone:
-                return electricity_mix
-        return None
+        return self.__electricity_mixes.get(zone)
+
+    def list_electricity_mixes(self) -> list[ElectricityMix]:
+        return list(self.__electricity_mixes.values())
 
     @classmethod
     def from_csv(cls, filepath: Optional[str] = None) -> "ElectricityMixRepository":
         if filepath is None:
-            filepath = os.path.join(
-                os.path.dirname(os.path.realpath(__file__)), "data", "electricity_mixes.csv"
-            )
-        electricity_mixes = []
-        with open(filepath) as fd:
-            csv = DictReader(fd)
-            for row in csv:
-                electricity_mixes.append(
+            filepath = DEFAULT_ELECTRICITY_MIXES_PATH
+        with open(filepath, encoding="utf-8", newline="") as fd:
+            reader = csv.reader(fd)
+            header = next(reader, None)
+            if header is None:
+                return cls([])
+            columns = []
+            for column in ("name", "adpe", "pe", "gwp"):
+                if column not in header:
+                    raise ValueError(f"missing column {column!r} in {filepath}")
+                columns.append(header.index(column))
+            i_zone, i_adpe, i_pe, i_gwp = columns
+            try:
+                electricity_mixes = [
                     ElectricityMix(
-                        zone=row["name"],
-                        adpe=float(row["adpe"]),
-                        pe=float(row["pe"]),
-                        gwp=float(row["gwp"]),
+                        zone=sys.intern(row[i_zone]),
+                        adpe=float(row[i_adpe]),
+                        pe=float(row[i_pe]),
+                        gwp=float(row[i_gwp]),
                     )
-                )
+                    for row in reader
+                    if row
+                ]
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"invalid electricity mix at line {reader.line_num} of {filepath}") from e
         return cls(electricity_mixes)
 
 
-electricity_mixes = ElectricityMixRepository.from_csv()
+@lru_cache(maxsize=1)
+def get_electricity_mixes() -> ElectricityMixRepository:
+    """
+    Get the default repository of electricity mixes, loaded on first call.
+
+    Returns:
+        The repository of electricity mixes built from the bundled CSV file.
+    """
+    return ElectricityMixRepository.from_csv()
+
+
+def __getattr__(name: str) -> ElectricityMixRepository:
+    # Load the default repository on first access rather than at import time
+    if name == "electricity_mixes":
+        return get_electricity_mixes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
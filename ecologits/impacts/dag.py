@@ -1,6 +1,6 @@
 from functools import wraps
 from graphlib import TopologicalSorter
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 
 class DAG:
@@ -11,6 +11,7 @@ class DAG:
     def __init__(self) -> None:
         self.__tasks: dict[str, Callable] = {}
         self.__dependencies: dict[str, set] = {}
+        self.__order: Optional[list[str]] = None
 
     def asset(self, func: Callable) -> Callable:
         @wraps(func)
@@ -21,6 +22,7 @@ class DAG:
         self.__tasks[func.__name__] = func
         func_params = list(func.__annotations__.keys())[:-1]  # Ignore return type
         self.__dependencies[func.__name__] = set(func_params)
+        self.__order = None  # Invalidate the cached execution order
 
         return wrapper
 
@@ -28,10 +30,11 @@ class DAG:
         return TopologicalSorter(self.__dependencies)
 
     def execute(self, **kwargs: Any) -> dict[str, Any]:
-        ts = self.build_dag()
+        if self.__order is None:
+            self.__order = list(self.build_dag().static_order())
         results = kwargs.copy()  # Use initial params as the starting point
 
-        for task_name in ts.static_order():
+        for task_name in self.__order:
             if task_name in results:  # Skip execution if result already provided
                 continue
             task = self.__tasks[task_name]
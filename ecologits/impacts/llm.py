@@ -1,6 +1,8 @@
 import math
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from math import ceil
-from typing import Any, Optional, Union, cast
+from typing import Any, Optional, Union
 
 from ecologits.impacts.dag import DAG
 from ecologits.impacts.modeling import GWP, PE, ADPe, Embodied, Energy, Impacts, Usage
@@ -85,9 +87,8 @@ def generation_latency(
     gpu_latency_per_token_mean = gpu_latency_alpha * model_active_parameter_count + gpu_latency_beta
     gpu_latency_min = output_token_count * (gpu_latency_per_token_mean - 1.96 * gpu_latency_stdev)
     gpu_latency_max = output_token_count * (gpu_latency_per_token_mean + 1.96 * gpu_latency_stdev)
-    gpu_latency_interval = RangeValue(min=max(0, gpu_latency_min), max=gpu_latency_max)
-    if gpu_latency_interval < request_latency:
-        return gpu_latency_interval
+    if gpu_latency_max < request_latency:
+        return RangeValue(min=max(0, gpu_latency_min), max=gpu_latency_max)
     return request_latency
 
 @dag.asset
@@ -350,9 +351,221 @@ def request_embodied_pe(
     return (generation_latency / server_lifetime) * server_gpu_embodied_pe
 
 
+@dataclass(frozen=True)
+class _LLMImpactsInvariants:
+    """
+    Factors of the impacts dag that do not depend on the model size or on the request.
+    """
+    gpu_energy_alpha: float
+    gpu_energy_offset_min: float
+    gpu_energy_offset_max: float
+    gpu_latency_alpha: float
+    gpu_latency_offset_min: float
+    gpu_latency_offset_max: float
+    model_memory_per_parameter: float
+    gpu_memory: float
+    server_gpu_count: int
+    server_energy_per_gpu_second: float
+    server_gpu_embodied_gwp_per_gpu: float
+    server_gpu_embodied_adpe_per_gpu: float
+    server_gpu_embodied_pe_per_gpu: float
+    server_lifetime: float
+    datacenter_pue: float
+    if_electricity_mix_adpe: float
+    if_electricity_mix_pe: float
+    if_electricity_mix_gwp: float
+
+
+@lru_cache(maxsize=32)
+def _build_llm_impacts_invariants(
+        if_electricity_mix_adpe: float,
+        if_electricity_mix_pe: float,
+        if_electricity_mix_gwp: float,
+        model_quantization_bits: int,
+        gpu_energy_alpha: float,
+        gpu_energy_beta: float,
+        gpu_energy_stdev: float,
+        gpu_latency_alpha: float,
+        gpu_latency_beta: float,
+        gpu_latency_stdev: float,
+        gpu_memory: float,
+        gpu_embodied_gwp: float,
+        gpu_embodied_adpe: float,
+        gpu_embodied_pe: float,
+        server_gpu_count: int,
+        server_power: float,
+        server_embodied_gwp: float,
+        server_embodied_adpe: float,
+        server_embodied_pe: float,
+        server_lifetime: float,
+        datacenter_pue: float,
+        /,
+) -> _LLMImpactsInvariants:
+    """
+    Cached construction of the invariants, keyed on the positional parameters only.
+    """
+    return _LLMImpactsInvariants(
+        gpu_energy_alpha=gpu_energy_alpha,
+        gpu_energy_offset_min=gpu_energy_beta - 1.96 * gpu_energy_stdev,
+        gpu_energy_offset_max=gpu_energy_beta + 1.96 * gpu_energy_stdev,
+        gpu_latency_alpha=gpu_latency_alpha,
+        gpu_latency_offset_min=gpu_latency_beta - 1.96 * gpu_latency_stdev,
+        gpu_latency_offset_max=gpu_latency_beta + 1.96 * gpu_latency_stdev,
+        model_memory_per_parameter=1.2 * model_quantization_bits / 8,
+        gpu_memory=gpu_memory,
+        server_gpu_count=server_gpu_count,
+        server_energy_per_gpu_second=server_power / (3600 * server_gpu_count),
+        server_gpu_embodied_gwp_per_gpu=server_embodied_gwp / server_gpu_count + gpu_embodied_gwp,
+        server_gpu_embodied_adpe_per_gpu=server_embodied_adpe / server_gpu_count + gpu_embodied_adpe,
+        server_gpu_embodied_pe_per_gpu=server_embodied_pe / server_gpu_count + gpu_embodied_pe,
+        server_lifetime=server_lifetime,
+        datacenter_pue=datacenter_pue,
+        if_electricity_mix_adpe=if_electricity_mix_adpe,
+        if_electricity_mix_pe=if_electricity_mix_pe,
+        if_electricity_mix_gwp=if_electricity_mix_gwp,
+    )
+
+
+def _compute_llm_impacts_invariants(
+        if_electricity_mix_adpe: float,
+        if_electricity_mix_pe: float,
+        if_electricity_mix_gwp: float,
+        model_quantization_bits: Optional[int] = MODEL_QUANTIZATION_BITS,
+        gpu_energy_alpha: Optional[float] = GPU_ENERGY_ALPHA,
+        gpu_energy_beta: Optional[float] = GPU_ENERGY_BETA,
+        gpu_energy_stdev: Optional[float] = GPU_ENERGY_STDEV,
+        gpu_latency_alpha: Optional[float] = GPU_LATENCY_ALPHA,
+        gpu_latency_beta: Optional[float] = GPU_LATENCY_BETA,
+        gpu_latency_stdev: Optional[float] = GPU_LATENCY_STDEV,
+        gpu_memory: Optional[float] = GPU_MEMORY,
+        gpu_embodied_gwp: Optional[float] = GPU_EMBODIED_IMPACT_GWP,
+        gpu_embodied_adpe: Optional[float] = GPU_EMBODIED_IMPACT_ADPE,
+        gpu_embodied_pe: Optional[float] = GPU_EMBODIED_IMPACT_PE,
+        server_gpu_count: Optional[int] = SERVER_GPUS,
+        server_power: Optional[float] = SERVER_POWER,
+        server_embodied_gwp: Optional[float] = SERVER_EMBODIED_IMPACT_GWP,
+        server_embodied_adpe: Optional[float] = SERVER_EMBODIED_IMPACT_ADPE,
+        server_embodied_pe: Optional[float] = SERVER_EMBODIED_IMPACT_PE,
+        server_lifetime: Optional[float] = HARDWARE_LIFESPAN,
+        datacenter_pue: Optional[float] = DATACENTER_PUE,
+) -> _LLMImpactsInvariants:
+    """
+    Precompute the factors of the impacts dag shared by every evaluation with the same hardware and electricity mix.
+
+    Results are cached, as successive requests usually share the same electricity mix and hardware defaults.
+    This is the single entry point to the cached builder: parameters are always forwarded positionally so that
+    keyword and default arguments share cache entries.
+    """
+    return _build_llm_impacts_invariants(
+        if_electricity_mix_adpe,
+        if_electricity_mix_pe,
+        if_electricity_mix_gwp,
+        model_quantization_bits,
+        gpu_energy_alpha,
+        gpu_energy_beta,
+        gpu_energy_stdev,
+        gpu_latency_alpha,
+        gpu_latency_beta,
+        gpu_latency_stdev,
+        gpu_memory,
+        gpu_embodied_gwp,
+        gpu_embodied_adpe,
+        gpu_embodied_pe,
+        server_gpu_count,
+        server_power,
+        server_embodied_gwp,
+        server_embodied_adpe,
+        server_embodied_pe,
+        server_lifetime,
+        datacenter_pue,
+    )
+
+
+def _compute_llm_impacts_closed_form(
+        invariants: _LLMImpactsInvariants,
+        model_active_parameter_count: float,
+        model_total_parameter_count: float,
+        output_token_count: float,
+        request_latency: float,
+) -> dict[str, ValueOrRange]:
+    """
+    Evaluate the assets of the impacts dag inline, in topological order.
+
+    Same formulas as the `@dag.asset` functions above, without the generic dispatch overhead. Any change to an
+    asset must be reflected here. Intervals are carried as plain (min, max) floats and only converted to
+    `RangeValue` in the returned results.
+    """
+    inv = invariants
+    gpu_energy_per_token = inv.gpu_energy_alpha * model_active_parameter_count
+    gpu_energy_min = max(0, output_token_count * (gpu_energy_per_token + inv.gpu_energy_offset_min))
+    gpu_energy_max = output_token_count * (gpu_energy_per_token + inv.gpu_energy_offset_max)
+
+    gpu_latency_per_token = inv.gpu_latency_alpha * model_active_parameter_count
+    latency_min = max(0, output_token_count * (gpu_latency_per_token + inv.gpu_latency_offset_min))
+    latency_max = output_token_count * (gpu_latency_per_token + inv.gpu_latency_offset_max)
+    latency_is_range = latency_max < request_latency
+    if not latency_is_range:
+        latency_min = latency_max = request_latency
+
+    model_required_memory = inv.model_memory_per_parameter * model_total_parameter_count
+    gpu_required_count = ceil(model_required_memory / inv.gpu_memory)
+    server_energy_factor = gpu_required_count * inv.server_energy_per_gpu_second
+    server_energy_min = latency_min * server_energy_factor
+    server_energy_max = latency_max * server_energy_factor
+    request_energy_min = inv.datacenter_pue * (server_energy_min + gpu_required_count * gpu_energy_min)
+    request_energy_max = inv.datacenter_pue * (server_energy_max + gpu_required_count * gpu_energy_max)
+
+    server_gpu_embodied_gwp = gpu_required_count * inv.server_gpu_embodied_gwp_per_gpu
+    server_gpu_embodied_adpe = gpu_required_count * inv.server_gpu_embodied_adpe_per_gpu
+    server_gpu_embodied_pe = gpu_required_count * inv.server_gpu_embodied_pe_per_gpu
+    lifetime_share_min = latency_min / inv.server_lifetime
+    lifetime_share_max = latency_max / inv.server_lifetime
+
+    def latency_bound(value_min: float, value_max: float) -> ValueOrRange:
+        if latency_is_range:
+            return RangeValue(min=value_min, max=value_max)
+        return value_max
+
+    return {
+        "gpu_energy": RangeValue(min=gpu_energy_min, max=gpu_energy_max),
+        "generation_latency": latency_bound(latency_min, latency_max),
+        "model_required_memory": model_required_memory,
+        "gpu_required_count": gpu_required_count,
+        "server_energy": latency_bound(server_energy_min, server_energy_max),
+        "request_energy": RangeValue(min=request_energy_min, max=request_energy_max),
+        "request_usage_gwp": RangeValue(
+            min=request_energy_min * inv.if_electricity_mix_gwp,
+            max=request_energy_max * inv.if_electricity_mix_gwp
+        ),
+        "request_usage_adpe": RangeValue(
+            min=request_energy_min * inv.if_electricity_mix_adpe,
+            max=request_energy_max * inv.if_electricity_mix_adpe
+        ),
+        "request_usage_pe": RangeValue(
+            min=request_energy_min * inv.if_electricity_mix_pe,
+            max=request_energy_max * inv.if_electricity_mix_pe
+        ),
+        "server_gpu_embodied_gwp": server_gpu_embodied_gwp,
+        "server_gpu_embodied_adpe": server_gpu_embodied_adpe,
+        "server_gpu_embodied_pe": server_gpu_embodied_pe,
+        "request_embodied_gwp": latency_bound(
+            lifetime_share_min * server_gpu_embodied_gwp,
+            lifetime_share_max * server_gpu_embodied_gwp
+        ),
+        "request_embodied_adpe": latency_bound(
+            lifetime_share_min * server_gpu_embodied_adpe,
+            lifetime_share_max * server_gpu_embodied_adpe
+        ),
+        "request_embodied_pe": latency_bound(
+            lifetime_share_min * server_gpu_embodied_pe,
+            lifetime_share_max * server_gpu_embodied_pe
+        ),
+    }
+
+
 def compute_llm_impacts_dag(
-        model_active_parameter_count: ValueOrRange,
-        model_total_parameter_count: ValueOrRange,
+        model_active_parameter_count: float,
+        model_total_parameter_count: float,
         output_token_count: float,
         request_latency: float,
         if_electricity_mix_adpe: float,
@@ -376,6 +589,7 @@ def compute_llm_impacts_dag(
         server_embodied_pe: Optional[float] = SERVER_EMBODIED_IMPACT_PE,
         server_lifetime: Optional[float] = HARDWARE_LIFESPAN,
         datacenter_pue: Optional[float] = DATACENTER_PUE,
+        use_dag: bool = False,
 ) -> dict[str, ValueOrRange]:
     """
     Compute the impacts dag of an LLM generation request.
@@ -406,19 +620,46 @@ def compute_llm_impacts_dag(
         server_embodied_pe: PE embodied impact of the server in MJ.
         server_lifetime: Lifetime duration of the server in seconds.
         datacenter_pue: PUE of the datacenter.
+        use_dag: Execute the generic DAG instead of the inlined formulas (for debugging).
 
     Returns:
         The impacts dag with all intermediate states.
     """
-    results = dag.execute(
-        model_active_parameter_count=model_active_parameter_count,
-        model_total_parameter_count=model_total_parameter_count,
-        model_quantization_bits=model_quantization_bits,
-        output_token_count=output_token_count,
-        request_latency=request_latency,
-        if_electricity_mix_gwp=if_electricity_mix_gwp,
+    inputs: dict[str, Any] = {
+        "model_active_parameter_count": model_active_parameter_count,
+        "model_total_parameter_count": model_total_parameter_count,
+        "model_quantization_bits": model_quantization_bits,
+        "output_token_count": output_token_count,
+        "request_latency": request_latency,
+        "if_electricity_mix_gwp": if_electricity_mix_gwp,
+        "if_electricity_mix_adpe": if_electricity_mix_adpe,
+        "if_electricity_mix_pe": if_electricity_mix_pe,
+        "gpu_energy_alpha": gpu_energy_alpha,
+        "gpu_energy_beta": gpu_energy_beta,
+        "gpu_energy_stdev": gpu_energy_stdev,
+        "gpu_latency_alpha": gpu_latency_alpha,
+        "gpu_latency_beta": gpu_latency_beta,
+        "gpu_latency_stdev": gpu_latency_stdev,
+        "gpu_memory": gpu_memory,
+        "gpu_embodied_gwp": gpu_embodied_gwp,
+        "gpu_embodied_adpe": gpu_embodied_adpe,
+        "gpu_embodied_pe": gpu_embodied_pe,
+        "server_gpu_count": server_gpu_count,
+        "server_power": server_power,
+        "server_embodied_gwp": server_embodied_gwp,
+        "server_embodied_adpe": server_embodied_adpe,
+        "server_embodied_pe": server_embodied_pe,
+        "server_lifetime": server_lifetime,
+        "datacenter_pue": datacenter_pue,
+    }
+    if use_dag:
+        return dag.execute(**inputs)
+
+    invariants = _compute_llm_impacts_invariants(
         if_electricity_mix_adpe=if_electricity_mix_adpe,
         if_electricity_mix_pe=if_electricity_mix_pe,
+        if_electricity_mix_gwp=if_electricity_mix_gwp,
+        model_quantization_bits=model_quantization_bits,
         gpu_energy_alpha=gpu_energy_alpha,
         gpu_energy_beta=gpu_energy_beta,
         gpu_energy_stdev=gpu_energy_stdev,
@@ -437,7 +678,52 @@ def compute_llm_impacts_dag(
         server_lifetime=server_lifetime,
         datacenter_pue=datacenter_pue,
     )
-    return results
+    results = _compute_llm_impacts_closed_form(
+        invariants,
+        model_active_parameter_count,
+        model_total_parameter_count,
+        output_token_count,
+        request_latency,
+    )
+    return {**inputs, **results}
+
+
+def _lower_bound(value: ValueOrRange) -> Union[float, int]:
+    return value.min if isinstance(value, RangeValue) else value
+
+
+def _upper_bound(value: ValueOrRange) -> Union[float, int]:
+    return value.max if isinstance(value, RangeValue) else value
+
+
+def _llm_impacts_from_results(results: dict[str, ValueOrRange]) -> Impacts:
+    """
+    Build the impacts data model from the request level results of the impacts dag.
+    """
+    energy = Energy(value=results["request_energy"])
+    gwp_usage = GWP(value=results["request_usage_gwp"])
+    adpe_usage = ADPe(value=results["request_usage_adpe"])
+    pe_usage = PE(value=results["request_usage_pe"])
+    gwp_embodied = GWP(value=results["request_embodied_gwp"])
+    adpe_embodied = ADPe(value=results["request_embodied_adpe"])
+    pe_embodied = PE(value=results["request_embodied_pe"])
+    return Impacts(
+        energy=energy,
+        gwp=gwp_usage + gwp_embodied,
+        adpe=adpe_usage + adpe_embodied,
+        pe=pe_usage + pe_embodied,
+        usage=Usage(
+            energy=energy,
+            gwp=gwp_usage,
+            adpe=adpe_usage,
+            pe=pe_usage
+        ),
+        embodied=Embodied(
+            gwp=gwp_embodied,
+            adpe=adpe_embodied,
+            pe=pe_embodied
+        )
+    )
 
 
 def compute_llm_impacts(
@@ -469,67 +755,54 @@ def compute_llm_impacts(
     if request_latency is None:
         request_latency = math.inf
 
-    active_params = [model_active_parameter_count]
-    total_params = [model_total_parameter_count]
-
-    if isinstance(model_active_parameter_count, RangeValue) or isinstance(model_total_parameter_count, RangeValue):
-        if isinstance(model_active_parameter_count, RangeValue):
-            active_params = [model_active_parameter_count.min, model_active_parameter_count.max]
-        else:
-            active_params = [model_active_parameter_count, model_active_parameter_count]
-        if isinstance(model_total_parameter_count, RangeValue):
-            total_params = [model_total_parameter_count.min, model_total_parameter_count.max]
-        else:
-            total_params = [model_total_parameter_count, model_total_parameter_count]
-
-    results: dict[str, Union[RangeValue, float, int]] = {}
     fields = ["request_energy", "request_usage_gwp", "request_usage_adpe", "request_usage_pe",
               "request_embodied_gwp", "request_embodied_adpe", "request_embodied_pe"]
 
-    for act_param, tot_param in zip(active_params, total_params):
-        res = compute_llm_impacts_dag(
-            model_active_parameter_count=act_param,
-            model_total_parameter_count=tot_param,
-            output_token_count=output_token_count,
-            request_latency=request_latency,
-            if_electricity_mix_adpe=if_electricity_mix_adpe,
-            if_electricity_mix_pe=if_electricity_mix_pe,
-            if_electricity_mix_gwp=if_electricity_mix_gwp,
-            **kwargs
-        )
-        for field in fields:
-            if field in results:
-                min_result = results[field]
-                max_result = res[field]
-                if isinstance(min_result, RangeValue):
-                    min_result = cast(Union[float, int], min_result.min)
-                if isinstance(max_result, RangeValue):
-                    max_result = cast(Union[float, int], max_result.max)
-                results[field] = RangeValue(min=min_result, max=max_result)
-            else:
-                results[field] = res[field]
+    if output_token_count == 0:
+        # Nothing was generated, every impact is zero
+        return _llm_impacts_from_results({field: RangeValue(min=0.0, max=0.0) for field in fields})
 
-    energy = Energy(value=results["request_energy"])
-    gwp_usage = GWP(value=results["request_usage_gwp"])
-    adpe_usage = ADPe(value=results["request_usage_adpe"])
-    pe_usage = PE(value=results["request_usage_pe"])
-    gwp_embodied = GWP(value=results["request_embodied_gwp"])
-    adpe_embodied = ADPe(value=results["request_embodied_adpe"])
-    pe_embodied = PE(value=results["request_embodied_pe"])
-    return Impacts(
-        energy=energy,
-        gwp=gwp_usage + gwp_embodied,
-        adpe=adpe_usage + adpe_embodied,
-        pe=pe_usage + pe_embodied,
-        usage=Usage(
-            energy=energy,
-            gwp=gwp_usage,
-            adpe=adpe_usage,
-            pe=pe_usage
-        ),
-        embodied=Embodied(
-            gwp=gwp_embodied,
-            adpe=adpe_embodied,
-            pe=pe_embodied
-        )
+    # Factors shared by the lower and upper bound evaluations are computed once
+    invariants = _compute_llm_impacts_invariants(
+        if_electricity_mix_adpe=if_electricity_mix_adpe,
+        if_electricity_mix_pe=if_electricity_mix_pe,
+        if_electricity_mix_gwp=if_electricity_mix_gwp,
+        **kwargs
     )
+    evaluate = partial(
+        _compute_llm_impacts_closed_form,
+        invariants,
+        output_token_count=output_token_count,
+        request_latency=request_latency,
+    )
+
+    if isinstance(model_active_parameter_count, RangeValue):
+        active_params = [model_active_parameter_count.min, model_active_parameter_count.max]
+    else:
+        active_params = [model_active_parameter_count, model_active_parameter_count]
+    if isinstance(model_total_parameter_count, RangeValue):
+        total_params = [model_total_parameter_count.min, model_total_parameter_count.max]
+    else:
+        total_params = [model_total_parameter_count, model_total_parameter_count]
+
+    if active_params[0] == active_params[1] and total_params[0] == total_params[1]:
+        # Scalar parameters (or degenerate ranges), a single evaluation is enough
+        results = evaluate(
+            model_active_parameter_count=active_params[0],
+            model_total_parameter_count=total_params[0],
+        )
+    else:
+        results_min = evaluate(
+            model_active_parameter_count=active_params[0],
+            model_total_parameter_count=total_params[0],
+        )
+        results_max = evaluate(
+            model_active_parameter_count=active_params[1],
+            model_total_parameter_count=total_params[1],
+        )
+        results = {
+            field: RangeValue(min=_lower_bound(results_min[field]), max=_upper_bound(results_max[field]))
+            for field in fields
+        }
+
+    return _llm_impacts_from_results(results)
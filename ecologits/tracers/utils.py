@@ -2,7 +2,7 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from ecologits.electricity_mix_repository import electricity_mixes
+from ecologits.electricity_mix_repository import get_electricity_mixes
 from ecologits.impacts.llm import compute_llm_impacts
 from ecologits.impacts.modeling import GWP, PE, ADPe, Embodied, Energy, Usage
 from ecologits.log import logger
@@ -86,7 +86,7 @@ def llm_impacts(
         model_total_params = model.architecture.parameters
         model_active_params = model.architecture.parameters
 
-    electricity_mix = electricity_mixes.find_electricity_mix(zone=electricity_mix_zone)
+    electricity_mix = get_electricity_mixes().find_electricity_mix(zone=electricity_mix_zone)
     if electricity_mix is None:
         error = ZoneNotRegisteredError(message=f"Could not find electricity mix for `{electricity_mix_zone}` zone.")
         logger.warning_once(str(error))
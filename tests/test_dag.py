@@ -0,0 +1,19 @@
+from ecologits.impacts.dag import DAG
+
+
+def test_dag_executes_asset_registered_after_first_execution():
+    dag = DAG()
+
+    @dag.asset
+    def double(x: float) -> float:
+        return 2 * x
+
+    results = dag.execute(x=3)
+    assert results == {"x": 3, "double": 6}
+
+    @dag.asset
+    def plus_one(double: float) -> float:
+        return double + 1
+
+    results = dag.execute(x=3)
+    assert results == {"x": 3, "double": 6, "plus_one": 7}
@@ -3,8 +3,10 @@ from operator import ge, gt
 import numpy as np
 import pytest
 
-from ecologits.impacts.llm import compute_llm_impacts
+import ecologits.impacts.llm as llm
+from ecologits.impacts.llm import _build_llm_impacts_invariants, compute_llm_impacts, compute_llm_impacts_dag
 from ecologits.impacts.modeling import GWP, PE, ADPe, Embodied, Energy, Impacts, Usage
+from ecologits.utils.range_value import RangeValue
 
 
 @pytest.mark.parametrize(
@@ -43,6 +45,156 @@ def test_compute_llm_impacts(model_active_parameter_count: float,
     assert impacts.embodied.pe.value > 0
 
 
+def _bounds(value):
+    if isinstance(value, RangeValue):
+        return value.min, value.max
+    return value, value
+
+
+@pytest.mark.parametrize(
+    ["model_active_parameter_count", "model_total_parameter_count", "output_token_count", "request_latency"],
+    [
+        (7.3, 7.3, 200, 5),         # Mistral 7B, generation latency bounded by the model
+        (12.9, 46.7, 200, 10),      # Mixtral 8x7B, generation latency bounded by the model
+        (440, 1760, 1000, 1),       # Large model, generation latency bounded by the request
+    ]
+)
+def test_compute_llm_impacts_dag_matches_closed_form(model_active_parameter_count: float,
+                                                     model_total_parameter_count: float,
+                                                     output_token_count: int,
+                                                     request_latency: float) -> None:
+    kwargs = dict(
+        model_active_parameter_count=model_active_parameter_count,
+        model_total_parameter_count=model_total_parameter_count,
+        output_token_count=output_token_count,
+        request_latency=request_latency,
+        if_electricity_mix_adpe=0.0000000737708,
+        if_electricity_mix_pe=9.988,
+        if_electricity_mix_gwp=0.590478,
+    )
+    results = compute_llm_impacts_dag(**kwargs)
+    dag_results = compute_llm_impacts_dag(**kwargs, use_dag=True)
+    assert results.keys() == dag_results.keys()
+    for key, value in results.items():
+        assert _bounds(value) == pytest.approx(_bounds(dag_results[key])), key
+
+
+def test_compute_llm_impacts_without_output_tokens() -> None:
+    impacts = compute_llm_impacts(
+        model_active_parameter_count=RangeValue(min=10, max=30),
+        model_total_parameter_count=RangeValue(min=40, max=120),
+        output_token_count=0,
+        request_latency=10,
+        if_electricity_mix_adpe=0.0000000737708,
+        if_electricity_mix_pe=9.988,
+        if_electricity_mix_gwp=0.590478,
+    )
+    assert isinstance(impacts.energy.value, RangeValue)
+    assert isinstance(impacts.gwp.value, RangeValue)
+    assert isinstance(impacts.embodied.pe.value, RangeValue)
+    assert impacts.energy.value == 0
+    assert impacts.gwp.value == 0
+    assert impacts.adpe.value == 0
+    assert impacts.pe.value == 0
+    assert impacts.usage.energy.value == 0
+    assert impacts.embodied.gwp.value == 0
+
+
+def test_compute_llm_impacts_with_range_parameters() -> None:
+    mix = dict(
+        output_token_count=200,
+        request_latency=10,
+        if_electricity_mix_adpe=0.0000000737708,
+        if_electricity_mix_pe=9.988,
+        if_electricity_mix_gwp=0.590478,
+    )
+    impacts = compute_llm_impacts(
+        model_active_parameter_count=RangeValue(min=10, max=30),
+        model_total_parameter_count=RangeValue(min=40, max=120),
+        **mix
+    )
+    impacts_min = compute_llm_impacts(model_active_parameter_count=10, model_total_parameter_count=40, **mix)
+    impacts_max = compute_llm_impacts(model_active_parameter_count=30, model_total_parameter_count=120, **mix)
+
+    assert isinstance(impacts.energy.value, RangeValue)
+    assert impacts.energy.value.min == pytest.approx(impacts_min.energy.value.min)
+    assert impacts.energy.value.max == pytest.approx(impacts_max.energy.value.max)
+    assert impacts.gwp.value.min == pytest.approx(impacts_min.gwp.value.min)
+    assert impacts.gwp.value.max == pytest.approx(impacts_max.gwp.value.max)
+    assert impacts.embodied.pe.value.min == pytest.approx(impacts_min.embodied.pe.value.min)
+    assert impacts.embodied.pe.value.max == pytest.approx(impacts_max.embodied.pe.value.max)
+
+
+def test_compute_llm_impacts_with_degenerate_range_parameters(monkeypatch) -> None:
+    mix = dict(
+        output_token_count=200,
+        request_latency=10,
+        if_electricity_mix_adpe=0.0000000737708,
+        if_electricity_mix_pe=9.988,
+        if_electricity_mix_gwp=0.590478,
+    )
+    evaluations = []
+    closed_form = llm._compute_llm_impacts_closed_form
+
+    def counting_closed_form(*args, **kwargs):
+        evaluations.append(kwargs)
+        return closed_form(*args, **kwargs)
+
+    monkeypatch.setattr(llm, "_compute_llm_impacts_closed_form", counting_closed_form)
+
+    impacts = compute_llm_impacts(
+        model_active_parameter_count=RangeValue(min=10, max=10),
+        model_total_parameter_count=RangeValue(min=40, max=40),
+        **mix
+    )
+    assert len(evaluations) == 1
+    impacts_scalar = compute_llm_impacts(model_active_parameter_count=10, model_total_parameter_count=40, **mix)
+    assert impacts == impacts_scalar
+
+    evaluations.clear()
+    impacts_mixed = compute_llm_impacts(
+        model_active_parameter_count=RangeValue(min=10, max=10),
+        model_total_parameter_count=RangeValue(min=40, max=300),
+        **mix
+    )
+    assert len(evaluations) == 2
+    impacts_max = compute_llm_impacts(model_active_parameter_count=10, model_total_parameter_count=300, **mix)
+    assert impacts_mixed.energy.value.min == pytest.approx(impacts_scalar.energy.value.min)
+    assert impacts_mixed.energy.value.max == pytest.approx(impacts_max.energy.value.max)
+    assert impacts_mixed.energy.value.max > impacts_scalar.energy.value.max
+
+
+def test_llm_impacts_invariants_are_shared_across_entry_points() -> None:
+    mix = dict(if_electricity_mix_adpe=1.5e-8, if_electricity_mix_pe=4.2, if_electricity_mix_gwp=0.123)
+    _build_llm_impacts_invariants.cache_clear()
+    compute_llm_impacts(
+        model_active_parameter_count=7.3,
+        model_total_parameter_count=7.3,
+        output_token_count=200,
+        request_latency=5,
+        **mix
+    )
+    compute_llm_impacts_dag(
+        model_active_parameter_count=7.3,
+        model_total_parameter_count=7.3,
+        output_token_count=200,
+        request_latency=5,
+        **mix
+    )
+    compute_llm_impacts(
+        model_active_parameter_count=7.3,
+        model_total_parameter_count=7.3,
+        output_token_count=200,
+        request_latency=5,
+        gpu_memory=80,
+        datacenter_pue=1.2,
+        **mix
+    )
+    cache_info = _build_llm_impacts_invariants.cache_info()
+    assert cache_info.currsize == 1
+    assert cache_info.hits == 2
+
+
 def compare_impacts(impacts: Impacts, prev_impacts: Impacts, op=gt):
     assert op(impacts.energy, prev_impacts.energy)
     assert op(impacts.gwp, prev_impacts.gwp)
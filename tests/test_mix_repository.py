@@ -1,4 +1,10 @@
-from ecologits.electricity_mix_repository import ElectricityMix, ElectricityMixRepository
+import subprocess
+import sys
+
+import pytest
+
+from ecologits import electricity_mix_repository
+from ecologits.electricity_mix_repository import ElectricityMix, ElectricityMixRepository, get_electricity_mixes
 
 
 def test_create_electricity_mix_repository_default():
@@ -23,3 +29,57 @@ def test_find_unknown_zone():
     electricity_mixes = ElectricityMixRepository.from_csv()
     assert electricity_mixes.find_electricity_mix(zone="AAA") is None
 
+
+def test_list_electricity_mixes():
+    electricity_mixes = ElectricityMixRepository.from_csv()
+    mixes = electricity_mixes.list_electricity_mixes()
+    assert len(mixes) > 0
+    assert all(isinstance(m, ElectricityMix) for m in mixes)
+    assert any(m.zone == "WOR" for m in mixes)
+
+
+def test_default_electricity_mixes_is_not_loaded_on_import():
+    subprocess.run([
+        sys.executable,
+        "-c",
+        "import ecologits.electricity_mix_repository as m; assert m.get_electricity_mixes.cache_info().misses == 0",
+    ], check=True)
+
+
+def test_default_electricity_mixes_is_loaded_once():
+    get_electricity_mixes.cache_clear()
+    electricity_mixes = get_electricity_mixes()
+    assert get_electricity_mixes.cache_info().misses == 1
+    assert electricity_mix_repository.electricity_mixes is electricity_mixes
+    assert get_electricity_mixes() is electricity_mixes
+    assert get_electricity_mixes.cache_info().misses == 1
+    assert electricity_mixes.find_electricity_mix(zone="WOR") is not None
+
+
+def test_create_electricity_mix_repository_invalid_row(tmp_path):
+    filepath = tmp_path / "electricity_mixes.csv"
+    filepath.write_text("name,adpe,pe,gwp\nWOR,0.1,0.2,0.3\nFRA,0.1,,0.3\n")
+    with pytest.raises(ValueError, match="line 3"):
+        ElectricityMixRepository.from_csv(str(filepath))
+
+
+def test_create_electricity_mix_repository_missing_column(tmp_path):
+    filepath = tmp_path / "electricity_mixes.csv"
+    filepath.write_text("name,adpe,gwp\nWOR,0.1,0.3\n")
+    with pytest.raises(ValueError, match="missing column 'pe'"):
+        ElectricityMixRepository.from_csv(str(filepath))
+
+
+def test_create_electricity_mix_repository_skips_blank_rows(tmp_path):
+    filepath = tmp_path / "electricity_mixes.csv"
+    filepath.write_text("name,adpe,pe,gwp\nWOR,0.1,0.2,0.3\n\nFRA,0.1,0.2,0.3\n\n")
+    electricity_mixes = ElectricityMixRepository.from_csv(str(filepath))
+    assert len(electricity_mixes.list_electricity_mixes()) == 2
+    assert electricity_mixes.find_electricity_mix(zone="FRA") is not None
+
+
+def test_create_electricity_mix_repository_empty_file(tmp_path):
+    filepath = tmp_path / "electricity_mixes.csv"
+    filepath.write_text("")
+    electricity_mixes = ElectricityMixRepository.from_csv(str(filepath))
+    assert electricity_mixes.list_electricity_mixes() == []